@@ -1,24 +1,110 @@
+"""
+数据库配置
+
+使用 SQLite 时，每个新连接都会设置以下 PRAGMA（见 apply_sqlite_pragmas）：
+
+- journal_mode=WAL：写前日志，读操作不会阻塞写操作
+- synchronous=NORMAL：WAL 模式下提交只需少量 fsync，断电最多丢失最近的事务
+- cache_size=-65536：64MB 页缓存
+- mmap_size=268435456：256MB 内存映射读取
+- temp_store=MEMORY：临时表和索引放在内存中
+
+因此 main.py 中 create_hero、update_hero、delete_hero 等每次提交的开销
+是一次 WAL 追加写，而不是默认 DELETE 日志模式下的多次完整 fsync。
+"""
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
 from sqlmodel import create_engine,SQLModel,Session
-from typing import Generator
+from typing import Generator, Iterator
+import logging
 import os
 
 
 # 数据库 URL（默认使用 SQLite）
 DATABASE_URL = "sqlite:///./tutorial.db"
 
+# 设置环境变量 SQLMODEL_ECHO=1 时输出 SQL 语句（仅用于调试）
+SQL_ECHO = os.getenv("SQLMODEL_ECHO") == "1"
+
 # 创建数据库引擎
 engine = create_engine(
     DATABASE_URL,
-    echo=True,  # 开发时显示 SQL 语句
+    echo=SQL_ECHO,
+    # 连接池复用已打开的连接，避免每个会话重新打开数据库文件和设置 PRAGMA
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=False,  # 本地文件数据库无需在借出连接前探测
+    pool_recycle=-1,  # 连接不按时间回收，一直复用
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 )
 
+if not SQL_ECHO:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+def apply_sqlite_pragmas(engine):
+    """让引擎的每个新连接建立时设置 SQLite 性能参数"""
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")  # 写前日志，读写互不阻塞
+        cursor.execute("PRAGMA synchronous=NORMAL")  # WAL 模式下安全且更少 fsync
+        cursor.execute("PRAGMA cache_size=-65536")  # 页缓存 64MB
+        cursor.execute("PRAGMA mmap_size=268435456")  # 内存映射 256MB
+        cursor.execute("PRAGMA temp_store=MEMORY")  # 临时表放在内存中
+        cursor.close()
+
+if "sqlite" in DATABASE_URL:
+    apply_sqlite_pragmas(engine)
+
+# 数据库结构版本：新增表后加 1，下次启动时会创建缺少的表。
+# create_all 不会修改已有的表，已有表的字段变化需要迁移或删除后重建
+SCHEMA_VERSION = 1
+
 def create_db_and_tables():
     """创建数据库表"""
     SQLModel.metadata.create_all(engine)
     print("数据库表创建成功")
 
+def create_db_and_tables_if_needed():
+    """仅在数据库结构版本不一致时创建缺少的数据库表
+
+    SQLite 用 PRAGMA user_version 记录已建表的版本，版本一致时跳过建表，
+    启动开销只有一次 4 字节的 PRAGMA 读取。版本不一致时只会创建新表，
+    不会修改已有的表。
+    """
+    if "sqlite" not in DATABASE_URL:
+        create_db_and_tables()
+        return
+
+    with engine.connect() as connection:
+        version = connection.exec_driver_sql("PRAGMA user_version").scalar()
+        if version == SCHEMA_VERSION:
+            return
+        create_db_and_tables()
+        connection.exec_driver_sql(f"PRAGMA user_version={SCHEMA_VERSION}")
+        connection.commit()
+
 def get_session() -> Generator[Session,None,None]:
     """获取数据库会话"""
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+    # 提交后不让对象过期，避免再次访问属性时重新查询数据库
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """以 with 语句使用的数据库会话
+
+    正常结束时提交，出错时回滚并重新抛出异常，最后总会关闭会话，
+    连接因此一定会归还到连接池。脚本中使用它，get_session 留给 FastAPI 依赖注入。
+    """
+    session = Session(engine, expire_on_commit=False)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -5,13 +5,21 @@
 这个文件展示了如何使用 GUI 工具生成的 SQLModel 代码
 """
 
+from dataclasses import fields, is_dataclass
 from datetime import datetime, date, time
 from decimal import Decimal
-from sqlmodel import SQLModel, Field, create_engine, Session
+from pydantic import ConfigDict
+from sqlalchemy import JSON, insert
+from sqlmodel import SQLModel, Field, create_engine, Session, select
 from typing import Optional, List, Dict, Any
+import io
+import sys
 import uuid
 from enum import Enum
 
+from config.database import SQL_ECHO
+from models.field_types import ScaledDecimal, UUIDBinary
+
 # 状态枚举（示例）
 class UserStatus(str, Enum):
     """用户状态枚举"""
@@ -23,6 +31,8 @@ class UserStatus(str, Enum):
 # 使用字段生成器生成的用户模型示例
 class User(SQLModel, table=True):
     """用户模型 - 使用字段生成器创建"""
+    # 延迟构建验证器，只建表不做验证时不产生开销
+    model_config = ConfigDict(defer_build=True)
     
     # 主键字段
     id: Optional[int] = Field(default=None, primary_key=True, description="用户ID")
@@ -38,6 +48,7 @@ class User(SQLModel, table=True):
         default=Decimal('0.00'), 
         max_digits=10, 
         decimal_places=2, 
+        sa_type=ScaledDecimal(2),  # 以"分"为单位的整数存储
         description="账户余额"
     )
     
@@ -53,12 +64,16 @@ class User(SQLModel, table=True):
     last_login_time: Optional[time] = Field(default=None, description="最后登录时间")
     
     # 特殊类型字段
-    uuid_field: uuid.UUID = Field(default_factory=uuid.uuid4, description="唯一标识符")
+    uuid_field: uuid.UUID = Field(
+        default_factory=uuid.uuid4,
+        sa_type=UUIDBinary,  # 16 字节二进制存储
+        description="唯一标识符"
+    )
     status: UserStatus = Field(default=UserStatus.ACTIVE, description="用户状态")
     
     # JSON 字段
-    preferences: Optional[Dict[str, Any]] = Field(default=None, description="用户偏好设置")
-    tags: Optional[List[str]] = Field(default=None, description="用户标签")
+    preferences: Optional[Dict[str, Any]] = Field(default=None, sa_type=JSON, description="用户偏好设置")
+    tags: Optional[List[str]] = Field(default=None, sa_type=JSON, description="用户标签")
     
     # 文本字段
     bio: Optional[str] = Field(default=None, max_length=500, description="个人简介")
@@ -67,6 +82,7 @@ class User(SQLModel, table=True):
 # 产品模型示例
 class Product(SQLModel, table=True):
     """产品模型 - 展示不同字段类型的使用"""
+    model_config = ConfigDict(defer_build=True)
     
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=200, description="产品名称")
@@ -77,83 +93,121 @@ class Product(SQLModel, table=True):
     is_available: bool = Field(default=True, description="是否可用")
     stock_quantity: int = Field(default=0, ge=0, description="库存数量")
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+# 用户列表只展示这几列，不读取 bio、notes、preferences、uuid_field 等其余字段
+_USER_LIST_STMT = select(
+    User.username,
+    User.email,
+    User.age,
+    User.balance,
+    User.status,
+    User.is_active,
+    User.created_at,
+    User.tags,
+)
+
+# 产品列表查询整张表，语句只构建一次后复用
+_PRODUCT_LIST_STMT = select(Product)
     
 def create_demo_data():
     """创建演示数据"""
     
     # 创建内存数据库
-    engine = create_engine("sqlite:///:memory:", echo=True)
+    engine = create_engine("sqlite:///:memory:", echo=SQL_ECHO)
     SQLModel.metadata.create_all(engine)
     
     with Session(engine) as session:
-        # 创建用户数据
-        user1 = User(
-            username="john_doe",
-            email="john@example.com",
-            full_name="John Doe",
-            age=30,
-            balance=Decimal('1500.50'),
-            is_verified=True,
-            birth_date=date(1993, 5, 15),
-            preferences={"theme": "dark", "language": "en"},
-            tags=["developer", "python", "sqlmodel"],
-            bio="Software developer with 5+ years experience"
-        )
+        # 整批数据共用一个创建时间，避免每行都调用一次 datetime.utcnow
+        ts = datetime.utcnow()
         
-        user2 = User(
-            username="jane_smith",
-            email="jane@example.com",
-            full_name="Jane Smith",
-            age=28,
-            balance=Decimal('2300.75'),
-            is_premium=True,
-            status=UserStatus.ACTIVE,
-            preferences={"theme": "light", "notifications": True},
-            tags=["designer", "ui/ux"]
-        )
+        # 创建用户数据：直接构造字典，通过一条批量 INSERT 写入（跳过 ORM 工作单元）
+        # executemany 要求每行的键一致，因此每行都写全相同的字段
+        user_rows = [
+            dict(
+                username="john_doe",
+                email="john@example.com",
+                full_name="John Doe",
+                age=30,
+                balance=Decimal('1500.50'),
+                is_verified=True,
+                is_premium=False,
+                status=UserStatus.ACTIVE,
+                birth_date=date(1993, 5, 15),
+                preferences={"theme": "dark", "language": "en"},
+                tags=["developer", "python", "sqlmodel"],
+                bio="Software developer with 5+ years experience",
+                created_at=ts
+            ),
+            dict(
+                username="jane_smith",
+                email="jane@example.com",
+                full_name="Jane Smith",
+                age=28,
+                balance=Decimal('2300.75'),
+                is_verified=False,
+                is_premium=True,
+                status=UserStatus.ACTIVE,
+                birth_date=None,
+                preferences={"theme": "light", "notifications": True},
+                tags=["designer", "ui/ux"],
+                bio=None,
+                created_at=ts
+            ),
+        ]
         
         # 创建产品数据
-        product1 = Product(
-            name="Python编程指南",
-            sku="BOOK-PY-001",
-            price=Decimal('59.99'),
-            cost=Decimal('25.00'),
-            weight=0.5,
-            stock_quantity=100
-        )
+        product_rows = [
+            dict(
+                name="Python编程指南",
+                sku="BOOK-PY-001",
+                price=Decimal('59.99'),
+                cost=Decimal('25.00'),
+                weight=0.5,
+                stock_quantity=100,
+                is_available=True,
+                created_at=ts
+            ),
+            dict(
+                name="SQLModel实战教程",
+                sku="BOOK-SQL-002",
+                price=Decimal('79.99'),
+                cost=Decimal('35.00'),
+                weight=0.6,
+                stock_quantity=50,
+                is_available=True,
+                created_at=ts
+            ),
+        ]
         
-        product2 = Product(
-            name="SQLModel实战教程",
-            sku="BOOK-SQL-002",
-            price=Decimal('79.99'),
-            cost=Decimal('35.00'),
-            weight=0.6,
-            stock_quantity=50,
-            is_available=True
-        )
-        
-        # 添加到数据库
-        session.add_all([user1, user2, product1, product2])
+        # 添加到数据库：每张表一条参数化 INSERT，最后统一提交
+        session.exec(insert(User.__table__), params=user_rows)
+        session.exec(insert(Product.__table__), params=product_rows)
         session.commit()
         
-        # 查询数据
-        print("\n=== 用户数据 ===")
-        users = session.query(User).all()
-        for user in users:
-            print(f"用户: {user.username} ({user.email})")
-            print(f"  年龄: {user.age}, 余额: {user.balance}")
-            print(f"  状态: {user.status}, 激活: {user.is_active}")
-            print(f"  创建时间: {user.created_at}")
-            print(f"  标签: {user.tags}")
-            print()
+        # 查询数据（每张表的输出先拼接好，再一次性写到标准输出）
+        buf = io.StringIO()
+        buf.write("\n=== 用户数据 ===\n")
+        for user in session.exec(_USER_LIST_STMT):
+            buf.write(
+                f"用户: {user.username} ({user.email})\n"
+                f"  年龄: {user.age}, 余额: {user.balance}\n"
+                f"  状态: {user.status}, 激活: {user.is_active}\n"
+                f"  创建时间: {user.created_at}\n"
+                f"  标签: {user.tags}\n"
+                "\n"
+            )
+        sys.stdout.write(buf.getvalue())
         
-        print("\n=== 产品数据 ===")
-        products = session.query(Product).all()
-        for product in products:
-            print(f"产品: {product.name} (SKU: {product.sku})")
-            print(f"  价格: {product.price}, 库存: {product.stock_quantity}")
-            print(f"  可用: {product.is_available}")
-            print()
+        buf = io.StringIO()
+        buf.write("\n=== 产品数据 ===\n")
+        for product in session.exec(_PRODUCT_LIST_STMT).all():
+            buf.write(
+                f"产品: {product.name} (SKU: {product.sku})\n"
+                f"  价格: {product.price}, 库存: {product.stock_quantity}\n"
+                f"  可用: {product.is_available}\n"
+                "\n"
+            )
+        sys.stdout.write(buf.getvalue())
         
         # 演示字段验证
         print("\n=== 字段验证演示 ===")
@@ -180,24 +234,28 @@ def create_demo_data():
         except Exception as e:
             print(f"年龄验证错误（预期）: {e}")
 
+def _constraint_items(constraint):
+    """取出单个约束对象的参数，例如 Ge(ge=0) -> [("ge", 0)]"""
+    if is_dataclass(constraint):
+        return [(f.name, getattr(constraint, f.name)) for f in fields(constraint)]
+    return list(getattr(constraint, "__dict__", {}).items())
+
 def demonstrate_field_features():
     """演示字段特性"""
     print("\n=== SQLModel 字段特性演示 ===")
     
     # 展示字段信息
     print("\n用户模型字段信息:")
-    for field_name, field_info in User.__fields__.items():
-        print(f"  {field_name}: {field_info.type_}")
-        if hasattr(field_info, 'field_info') and field_info.field_info:
-            constraints = []
-            if hasattr(field_info.field_info, 'max_length') and field_info.field_info.max_length:
-                constraints.append(f"max_length={field_info.field_info.max_length}")
-            if hasattr(field_info.field_info, 'ge') and field_info.field_info.ge is not None:
-                constraints.append(f"ge={field_info.field_info.ge}")
-            if hasattr(field_info.field_info, 'le') and field_info.field_info.le is not None:
-                constraints.append(f"le={field_info.field_info.le}")
-            if constraints:
-                print(f"    约束: {', '.join(constraints)}")
+    for field_name, field_info in User.model_fields.items():
+        print(f"  {field_name}: {field_info.annotation}")
+        # pydantic v2 把 max_length、ge、le 等约束统一放在 metadata 中
+        constraints = [
+            f"{name}={value}"
+            for constraint in field_info.metadata
+            for name, value in _constraint_items(constraint)
+        ]
+        if constraints:
+            print(f"    约束: {', '.join(constraints)}")
     
     # 展示默认值
     print("\n默认值演示:")
@@ -5,38 +5,165 @@ SQLModel 字段代码生成工具
 基于 GUI 界面的字段定义代码生成器
 """
 
-import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional
 import json
+import re
+
+# tkinter 在创建界面时才导入（见 _load_tk），只使用代码生成功能时不加载 Tcl/Tk
+tk = ttk = scrolledtext = messagebox = None
+
+def _load_tk():
+    """按需导入 tkinter 相关模块"""
+    global tk, ttk, scrolledtext, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, scrolledtext, messagebox
+
+# 字段类型映射（界面显示名称 -> Python 类型）
+_FIELD_TYPES = MappingProxyType({
+    "整数 (int)": "int",
+    "字符串 (str)": "str",
+    "布尔值 (bool)": "bool",
+    "浮点数 (float)": "float",
+    "精确小数 (Decimal)": "Decimal",
+    "日期时间 (datetime)": "datetime",
+    "日期 (date)": "date",
+    "时间 (time)": "time",
+    "UUID": "uuid.UUID",
+    "枚举 (Enum)": "Enum",
+    "JSON 字典 (Dict)": "Dict[str, Any]",
+    "字符串列表 (List[str])": "List[str]"
+})
+
+# 生成代码始终需要的导入
+_BASE_IMPORTS = frozenset({
+    "from typing import Optional",
+    "from sqlmodel import SQLModel, Field",
+})
+
+# 各字段类型额外需要的导入
+_DATETIME_IMPORT = frozenset({"from datetime import datetime, date, time"})
+_TYPING_IMPORT = frozenset({"from typing import Dict, List, Any"})
+_TYPE_IMPORTS = MappingProxyType({
+    "Decimal": frozenset({"from decimal import Decimal"}),
+    "datetime": _DATETIME_IMPORT,
+    "date": _DATETIME_IMPORT,
+    "time": _DATETIME_IMPORT,
+    "uuid.UUID": frozenset({"import uuid"}),
+    "Dict[str, Any]": _TYPING_IMPORT,
+    "List[str]": _TYPING_IMPORT,
+})
+
+@lru_cache(maxsize=128)
+def _imports_for(field_types: frozenset) -> tuple:
+    """根据使用到的字段类型生成排好序的导入语句（相同类型组合直接复用结果）"""
+    imports = _BASE_IMPORTS.union(
+        *(_TYPE_IMPORTS.get(field_type, ()) for field_type in field_types)
+    )
+    return tuple(sorted(imports))
+
+# 数字默认值（整数、小数、科学计数法，允许数字之间的下划线）
+_NUM_RE = re.compile(r"""
+    ^[+-]?
+    (?:\d(?:_?\d)*(?:\.(?:\d(?:_?\d)*)?)?  # 1、1_000、1.、1.5
+      |\.\d(?:_?\d)*)                      # .5
+    (?:[eE][+-]?\d(?:_?\d)*)?$             # 1e5、1E-3
+""", re.VERBOSE)
+
+# 特殊字面量默认值（小写输入 -> 生成的代码）
+_LITERAL_DEFAULTS = MappingProxyType({
+    "none": "None",
+    "null": "None",
+    "true": "True",
+    "false": "False",
+})
+
+@dataclass(slots=True)
+class FieldSpec:
+    """单个字段的定义信息"""
+    name: str
+    type: str
+    optional: bool
+    primary_key: bool
+    default: Optional[str] = None
+    description: Optional[str] = None
+    min_value: Optional[str] = None
+    max_value: Optional[str] = None
+    decimal_places: Optional[str] = None
+
+def _default_param(field_info: FieldSpec) -> Optional[str]:
+    """生成默认值参数"""
+    default = field_info.default
+    if default is None:
+        return "default=None" if field_info.optional else None
+    literal = _LITERAL_DEFAULTS.get(default.lower())
+    if literal is not None:
+        return f"default={literal}"
+    if default.startswith(('datetime.', 'uuid.')):
+        return f"default_factory={default}"
+    if _NUM_RE.match(default):
+        # 数字默认值
+        return f"default={default}"
+    # 字符串默认值
+    return f'default="{default}"'
+
+def _make_emitter(field_type: str):
+    """为指定字段类型生成专用的字段代码生成函数
+
+    与类型相关的判断（约束参数名、是否为 Decimal）在这里只做一次，
+    生成的函数处理每个字段时不再重复判断。
+    """
+    optional_annotation = f"Optional[{field_type}]"
+    # 字符串约束长度，其余类型约束取值范围
+    min_key, max_key = ("min_length", "max_length") if field_type == 'str' else ("ge", "le")
+    is_decimal = field_type == 'Decimal'
+    
+    def emit(field_info: FieldSpec) -> str:
+        params = []
+        default = _default_param(field_info)
+        if default is not None:
+            params.append(default)
+        if field_info.primary_key:
+            params.append("primary_key=True")
+        if field_info.min_value:
+            params.append(f"{min_key}={field_info.min_value}")
+        if field_info.max_value:
+            params.append(f"{max_key}={field_info.max_value}")
+            if is_decimal:
+                params.append(f"max_digits={field_info.max_value}")
+        if is_decimal and field_info.decimal_places:
+            params.append(f"decimal_places={field_info.decimal_places}")
+        if field_info.description:
+            params.append(f'description="{field_info.description}"')
+        
+        annotation = optional_annotation if field_info.optional else field_type
+        return f"{field_info.name}: {annotation} = Field({', '.join(params)})"
+    
+    return emit
+
+# 每种字段类型对应的代码生成函数
+_EMITTERS = MappingProxyType({
+    field_type: _make_emitter(field_type) for field_type in set(_FIELD_TYPES.values())
+})
 
 class FieldGeneratorGUI:
     """SQLModel 字段代码生成器 GUI"""
     
     def __init__(self, root):
+        _load_tk()
         self.root = root
         self.root.title("SQLModel 字段代码生成器")
         self.root.geometry("800x700")
         self.root.resizable(True, True)
         
         # 字段类型映射
-        self.field_types = {
-            "整数 (int)": "int",
-            "字符串 (str)": "str",
-            "布尔值 (bool)": "bool",
-            "浮点数 (float)": "float",
-            "精确小数 (Decimal)": "Decimal",
-            "日期时间 (datetime)": "datetime",
-            "日期 (date)": "date",
-            "时间 (time)": "time",
-            "UUID": "uuid.UUID",
-            "枚举 (Enum)": "Enum",
-            "JSON 字典 (Dict)": "Dict[str, Any]",
-            "字符串列表 (List[str])": "List[str]"
-        }
-        
-        # 存储字段信息
-        self.fields = []
+        self.field_types = _FIELD_TYPES
+        
+        # 存储字段信息（列表行 iid -> 字段定义，按添加顺序排列）
+        self.fields: dict[str, FieldSpec] = {}
         
         self.setup_ui()
     
@@ -67,6 +194,10 @@ class FieldGeneratorGUI:
         
         # 按钮区域
         self.create_button_section(main_frame)
+        
+        # 状态栏（操作成功的提示显示在这里，不再弹出对话框）
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
     
     def create_field_input_section(self, parent):
         """创建字段输入区域"""
@@ -152,13 +283,17 @@ class FieldGeneratorGUI:
         list_frame.rowconfigure(0, weight=1)
         
         # 字段列表
-        self.field_listbox = tk.Listbox(list_frame, height=6)
-        self.field_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        columns = ("name", "type", "optional", "primary_key")
+        self.field_tree = ttk.Treeview(list_frame, columns=columns, show="headings",
+                                       height=6, selectmode="browse")
+        for column, heading in zip(columns, ("字段名称", "类型", "可选", "主键")):
+            self.field_tree.heading(column, text=heading)
+        self.field_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # 滚动条
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.field_listbox.yview)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.field_tree.yview)
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.field_listbox.configure(yscrollcommand=scrollbar.set)
+        self.field_tree.configure(yscrollcommand=scrollbar.set)
         
         # 删除按钮
         ttk.Button(list_frame, text="删除选中字段", 
@@ -212,51 +347,48 @@ class FieldGeneratorGUI:
             messagebox.showerror("错误", "请选择字段类型")
             return
         
-        # 创建字段信息字典
-        field_info = {
-            'name': self.field_name_var.get().strip(),
-            'type': self.field_types[self.field_type_var.get()],
-            'optional': self.optional_var.get(),
-            'primary_key': self.primary_key_var.get(),
-            'default': self.default_value_var.get().strip() if self.default_value_var.get().strip() else None,
-            'description': self.description_var.get().strip() if self.description_var.get().strip() else None,
-            'min_value': self.min_value_var.get().strip() if self.min_value_var.get().strip() else None,
-            'max_value': self.max_value_var.get().strip() if self.max_value_var.get().strip() else None,
-            'decimal_places': self.decimal_places_var.get().strip() if self.decimal_places_var.get().strip() else None
-        }
-        
-        # 添加到字段列表
-        self.fields.append(field_info)
-        
-        # 更新列表显示
-        display_text = f"{field_info['name']} ({field_info['type']})"
-        if field_info['optional']:
-            display_text += " [可选]"
-        if field_info['primary_key']:
-            display_text += " [主键]"
-        
-        self.field_listbox.insert(tk.END, display_text)
+        # 创建字段信息（空输入记为 None）
+        field_info = FieldSpec(
+            name=self.field_name_var.get().strip(),
+            type=self.field_types[self.field_type_var.get()],
+            optional=self.optional_var.get(),
+            primary_key=self.primary_key_var.get(),
+            default=self.default_value_var.get().strip() or None,
+            description=self.description_var.get().strip() or None,
+            min_value=self.min_value_var.get().strip() or None,
+            max_value=self.max_value_var.get().strip() or None,
+            decimal_places=self.decimal_places_var.get().strip() or None
+        )
+        
+        # 添加到字段列表并显示
+        iid = self.field_tree.insert("", tk.END, values=(
+            field_info.name,
+            field_info.type,
+            "是" if field_info.optional else "",
+            "是" if field_info.primary_key else ""
+        ))
+        self.fields[iid] = field_info
         
         # 清空输入框
         self.clear_inputs()
         
-        messagebox.showinfo("成功", f"字段 '{field_info['name']}' 已添加")
+        self.status_label.config(text=f"字段 '{field_info.name}' 已添加")
     
     def remove_field(self):
         """删除选中的字段"""
-        selection = self.field_listbox.curselection()
+        selection = self.field_tree.selection()
         if not selection:
             messagebox.showwarning("警告", "请选择要删除的字段")
             return
         
-        index = selection[0]
-        field_name = self.fields[index]['name']
+        iid = selection[0]
+        field_name = self.fields[iid].name
         
         # 删除字段
-        del self.fields[index]
-        self.field_listbox.delete(index)
+        del self.fields[iid]
+        self.field_tree.delete(iid)
         
-        messagebox.showinfo("成功", f"字段 '{field_name}' 已删除")
+        self.status_label.config(text=f"字段 '{field_name}' 已删除")
     
     def clear_inputs(self):
         """清空输入框"""
@@ -275,7 +407,7 @@ class FieldGeneratorGUI:
         """清空所有内容"""
         if messagebox.askyesno("确认", "确定要清空所有字段吗？"):
             self.fields.clear()
-            self.field_listbox.delete(0, tk.END)
+            self.field_tree.delete(*self.field_tree.get_children())
             self.code_text.delete(1.0, tk.END)
             self.clear_inputs()
     
@@ -285,31 +417,18 @@ class FieldGeneratorGUI:
             messagebox.showwarning("警告", "请先添加字段")
             return
         
-        # 生成导入语句
-        imports = set()
-        imports.add("from typing import Optional")
-        imports.add("from sqlmodel import SQLModel, Field")
-        
-        # 根据字段类型添加必要的导入
-        for field in self.fields:
-            if field['type'] == 'Decimal':
-                imports.add("from decimal import Decimal")
-            elif field['type'] in ['datetime', 'date', 'time']:
-                imports.add("from datetime import datetime, date, time")
-            elif field['type'] == 'uuid.UUID':
-                imports.add("import uuid")
-            elif 'Dict' in field['type'] or 'List' in field['type']:
-                imports.add("from typing import Dict, List, Any")
+        # 生成导入语句（根据字段类型查表添加必要的导入）
+        field_types = frozenset(field.type for field in self.fields.values())
         
         # 生成代码
         code_lines = []
-        code_lines.extend(sorted(imports))
+        code_lines.extend(_imports_for(field_types))
         code_lines.append("")
         code_lines.append("class GeneratedModel(SQLModel, table=True):")
         code_lines.append('    """自动生成的模型类"""')
         code_lines.append("")
         
-        for field in self.fields:
+        for field in self.fields.values():
             field_code = self.generate_field_code(field)
             code_lines.append(f"    {field_code}")
         
@@ -317,81 +436,11 @@ class FieldGeneratorGUI:
         self.code_text.delete(1.0, tk.END)
         self.code_text.insert(1.0, "\n".join(code_lines))
         
-        messagebox.showinfo("成功", "代码生成完成！")
+        self.status_label.config(text="代码生成完成！")
     
-    def generate_field_code(self, field_info: Dict[str, Any]) -> str:
+    def generate_field_code(self, field_info: FieldSpec) -> str:
         """生成单个字段的代码"""
-        name = field_info['name']
-        field_type = field_info['type']
-        
-        # 处理可选类型
-        if field_info['optional']:
-            type_annotation = f"Optional[{field_type}]"
-        else:
-            type_annotation = field_type
-        
-        # 构建 Field 参数
-        field_params = []
-        
-        # 默认值
-        if field_info['default'] is not None:
-            if field_info['default'].lower() in ['none', 'null']:
-                field_params.append("default=None")
-            elif field_info['default'].lower() == 'true':
-                field_params.append("default=True")
-            elif field_info['default'].lower() == 'false':
-                field_params.append("default=False")
-            elif field_info['default'].startswith('datetime.'):
-                field_params.append(f"default_factory={field_info['default']}")
-            elif field_info['default'].startswith('uuid.'):
-                field_params.append(f"default_factory={field_info['default']}")
-            else:
-                try:
-                    # 尝试解析为数字
-                    float(field_info['default'])
-                    field_params.append(f"default={field_info['default']}")
-                except ValueError:
-                    # 字符串默认值
-                    field_params.append(f'default="{field_info["default"]}"')
-        elif field_info['optional']:
-            field_params.append("default=None")
-        
-        # 主键
-        if field_info['primary_key']:
-            field_params.append("primary_key=True")
-        
-        # 最小值/长度
-        if field_info['min_value']:
-            if field_type == 'str':
-                field_params.append(f"min_length={field_info['min_value']}")
-            else:
-                field_params.append(f"ge={field_info['min_value']}")
-        
-        # 最大值/长度
-        if field_info['max_value']:
-            if field_type == 'str':
-                field_params.append(f"max_length={field_info['max_value']}")
-            else:
-                field_params.append(f"le={field_info['max_value']}")
-        
-        # Decimal 特殊参数
-        if field_type == 'Decimal':
-            if field_info['max_value']:
-                field_params.append(f"max_digits={field_info['max_value']}")
-            if field_info['decimal_places']:
-                field_params.append(f"decimal_places={field_info['decimal_places']}")
-        
-        # 描述
-        if field_info['description']:
-            field_params.append(f'description="{field_info["description"]}"')
-        
-        # 构建完整的字段定义
-        if field_params:
-            field_def = f"Field({', '.join(field_params)})"
-        else:
-            field_def = "Field()"
-        
-        return f"{name}: {type_annotation} = {field_def}"
+        return _EMITTERS[field_info.type](field_info)
     
     def copy_code(self):
         """复制生成的代码到剪贴板"""
@@ -402,10 +451,11 @@ class FieldGeneratorGUI:
         
         self.root.clipboard_clear()
         self.root.clipboard_append(code)
-        messagebox.showinfo("成功", "代码已复制到剪贴板")
+        self.status_label.config(text="代码已复制到剪贴板")
 
 def main():
     """主函数"""
+    _load_tk()
     root = tk.Tk()
     app = FieldGeneratorGUI(root)
     root.mainloop()
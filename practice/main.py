@@ -1,131 +1,298 @@
-from typing import List
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List
+import logging
+import threading
 from webbrowser import get
+from sqlalchemy import bindparam, delete, event, insert, inspect, literal, update
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session, select
-from config.database import create_db_and_tables, get_session
+from config.database import create_db_and_tables_if_needed, session_scope
 from models.hero import Hero, HeroCreate
 
-def create_hero(session:Session,hero_data:HeroCreate)->Hero:
-    """创建英雄"""
-    hero = Hero.from_orm(hero_data)
+log = logging.getLogger(__name__)
+
+# Hero 的全部字段名，导入时计算一次
+_HERO_FIELDS = frozenset(Hero.model_fields)
+
+# get_hero_by_id 的结果缓存（英雄 ID -> 英雄副本），修改或删除英雄时失效。
+# 只保存已提交的数据：事务中从数据库查到的英雄先记在 session.info 里，提交后才写入缓存
+_HERO_CACHE: "OrderedDict[int, Hero]" = OrderedDict()
+_CACHE_MAX = 1024
+_CACHE_LOCK = threading.Lock()
+# 失效代数：每次失效加 1，并记下每个英雄最后一次失效时的代数。
+# 事务开始后被其他会话修改过的英雄，提交时不写入缓存
+_cache_generation = 0
+_HERO_INVALIDATED_AT: Dict[int,int] = {}
+_PENDING_KEY = "hero_cache_pending"
+_BEGIN_KEY = "hero_cache_begin"
+_INVALIDATED_KEY = "hero_cache_invalidated"
+
+# 常用查询语句只构建一次，SQLAlchemy 编译缓存按语句结构复用编译结果。
+# sqlmodel 的 select(Hero) 是 SelectOfScalar，session.exec 会直接返回
+# ScalarResult（英雄对象本身），不会先为每行构造 Row 再解包
+_SELECT_ALL_HEROES = select(Hero)
+_SELECT_HEROES_BY_IDS = select(Hero).where(Hero.id.in_(bindparam("ids",expanding=True)))
+
+def create_hero(session:Session,hero_data:HeroCreate,commit:bool=True)->Hero:
+    """创建英雄（commit=False 时只写入当前事务，由调用方统一提交）"""
+    # HeroCreate 已经验证过，table 模型构造时不会重复验证
+    hero = Hero(**hero_data.model_dump())
     # 会话
     session.add(hero)
-    session.commit()
-    session.refresh(hero)
+    if commit:
+        session.commit()
+    else:
+        # 不提交时也要 flush，让数据库分配主键
+        session.flush()
 
-    print(f"✅ 创建英雄成功: {hero.name}")
+    log.info("✅ 创建英雄成功: %s", hero.name)
     return hero
 
+def create_heroes(session:Session,hero_datas:List[HeroCreate],commit:bool=True)->List[Hero]:
+    """批量创建英雄（一条 INSERT 语句、一次提交）"""
+    # 没有参数时 INSERT 会按一行空值执行，空列表直接返回
+    if not hero_datas:
+        return []
+    rows = [hero_data.model_dump() for hero_data in hero_datas]
+    if session.get_bind().dialect.insert_executemany_returning:
+        # ORM 批量 INSERT：同一条预编译语句配多组参数执行（executemany），
+        # RETURNING 按参数顺序直接取回带主键的英雄对象（SQLite >= 3.35）
+        statement = insert(Hero).returning(Hero,sort_by_parameter_order=True)
+        heroes = session.exec(statement,params=rows).scalars().all()
+    else:
+        # 不支持时逐个加入会话，flush 时由数据库分配主键
+        heroes = [Hero(**row) for row in rows]
+        session.add_all(heroes)
+        session.flush()
+    if commit:
+        session.commit()
+
+    log.info("✅ 批量创建英雄成功: %d 个", len(heroes))
+    return heroes
+
+def iter_heroes(session:Session,chunk:int=1000)->Iterator[Hero]:
+    """逐个返回所有英雄（按 chunk 分批从数据库读取，内存占用不随行数增长）"""
+    yield from session.exec(_SELECT_ALL_HEROES,execution_options={"yield_per":chunk})
+
 def get_heroes(session:Session)->List[Hero]:
     """获取所有英雄"""
-    statement = select(Hero)
-    heroes = session.exec(statement).all()
-    print(f" 找到 {len(heroes)} 个英雄")
+    heroes = list(iter_heroes(session))
+    log.debug("找到 %d 个英雄", len(heroes))
     return heroes
 
+def _cache_hero(hero:Hero,generation:int)->None:
+    """缓存英雄的脱离会话副本，超过容量时淘汰最久未使用的
+
+    generation 是读取该英雄的事务开始时的失效代数，之后失效过的英雄不缓存。
+    """
+    snapshot = Hero(**hero.model_dump())
+    # 标记为已持久化但不属于任何会话，之后可以 merge 进其他会话
+    make_transient_to_detached(snapshot)
+    with _CACHE_LOCK:
+        if _HERO_INVALIDATED_AT.get(hero.id,0) > generation:
+            return
+        _HERO_CACHE[hero.id] = snapshot
+        _HERO_CACHE.move_to_end(hero.id)
+        if len(_HERO_CACHE) > _CACHE_MAX:
+            _HERO_CACHE.popitem(last=False)
+
+def _bump_generation(hero_id:int)->None:
+    """从缓存中移除英雄并记录失效代数"""
+    global _cache_generation
+    with _CACHE_LOCK:
+        _cache_generation += 1
+        _HERO_INVALIDATED_AT[hero_id] = _cache_generation
+        _HERO_CACHE.pop(hero_id,None)
+
+def _invalidate_hero(session:Session,hero_id:int)->None:
+    """修改或删除英雄后让缓存失效（包括当前事务中待写入缓存的记录）
+
+    修改提交前其他会话仍可能读到旧数据，因此提交后会再失效一次。
+    """
+    _bump_generation(hero_id)
+    session.info.get(_PENDING_KEY,set()).discard(hero_id)
+    session.info.setdefault(_INVALIDATED_KEY,set()).add(hero_id)
+
+@event.listens_for(Session,"after_begin")
+def _record_begin_generation(session,transaction,connection):
+    """事务开始时记下当前的失效代数"""
+    with _CACHE_LOCK:
+        session.info.setdefault(_BEGIN_KEY,_cache_generation)
+
+@event.listens_for(Session,"after_commit")
+def _cache_committed_heroes(session):
+    """事务提交后，把本事务中查到的英雄按提交后的状态写入缓存"""
+    for hero_id in session.info.pop(_INVALIDATED_KEY,()):
+        _bump_generation(hero_id)
+    generation = session.info.get(_BEGIN_KEY)
+    for hero_id in session.info.pop(_PENDING_KEY,()):
+        hero = session.identity_map.get(Session.identity_key(Hero,hero_id))
+        # 此时不能再查询数据库，属性已过期的英雄不缓存
+        if hero is not None and generation is not None and not inspect(hero).expired_attributes:
+            _cache_hero(hero,generation)
+
+@event.listens_for(Session,"after_transaction_end")
+def _discard_pending_heroes(session,transaction):
+    """事务结束（包括回滚）后丢弃未提交的待缓存记录"""
+    if transaction.parent is None:
+        for key in (_PENDING_KEY,_BEGIN_KEY,_INVALIDATED_KEY):
+            session.info.pop(key,None)
+
+@event.listens_for(Session,"after_flush")
+def _invalidate_flushed_heroes(session,flush_context):
+    """通过 ORM 修改或删除的英雄在 flush 时让缓存失效"""
+    for obj in (*session.dirty,*session.deleted):
+        if isinstance(obj,Hero):
+            _invalidate_hero(session,obj.id)
+
 def get_hero_by_id(session:Session,hero_id:int)->Hero | None:
-    """根据ID获取英雄"""
+    """根据ID获取英雄（带缓存）"""
+    # 会话中已有这个英雄时直接返回，保留其中尚未提交的修改。
+    # 它可能是之前的事务加载的，不知道是否已过时，因此不写入缓存
+    hero = session.identity_map.get(Session.identity_key(Hero,hero_id))
+    if hero is not None:
+        log.debug("🔍 找到英雄: %s", hero.name)
+        return hero
+
+    with _CACHE_LOCK:
+        cached = _HERO_CACHE.get(hero_id)
+        if cached is not None:
+            _HERO_CACHE.move_to_end(hero_id)
+    if cached is not None:
+        # load=False：直接把缓存副本放进当前会话，不查询数据库
+        hero = session.merge(cached,load=False)
+        log.debug("🔍 找到英雄（缓存）: %s", hero.name)
+        return hero
+
     hero = session.get(Hero,hero_id)
     if hero:
-        print(f"🔍 找到英雄: {hero.name}")
+        log.debug("🔍 找到英雄: %s", hero.name)
+        # 提交后才写入缓存，回滚时丢弃
+        session.info.setdefault(_PENDING_KEY,set()).add(hero_id)
     else:
-        print(f"❌ 未找到 ID 为 {hero_id} 的英雄")
+        log.warning("❌ 未找到 ID 为 %s 的英雄", hero_id)
     return hero
 
-def update_hero(session:Session,hero_id:int,hero_data:dict)->Hero | None:
-    """更新英雄"""
-    hero = session.get(Hero,hero_id)
+def hero_exists(session:Session,hero_id:int)->bool:
+    """判断英雄是否存在（只查询常量 1，不加载整行）"""
+    statement = select(literal(1)).where(Hero.id == hero_id)
+    return session.exec(statement).first() is not None
 
-    if not hero:
-        print(f"❌ 未找到 ID 为 {hero_id} 的英雄")
+def get_heroes_by_ids(session:Session,hero_ids:Iterable[int])->Dict[int,Hero]:
+    """根据多个 ID 一次性获取英雄（单条 IN 查询）
+
+    需要按 ID 逐个查询英雄时，先调用本函数取得 {id: 英雄}，再按 ID 取值，
+    避免在循环中反复调用 get_hero_by_id 产生 N 次查询。
+    """
+    heroes = session.exec(_SELECT_HEROES_BY_IDS,params={"ids":list(hero_ids)}).all()
+    return {hero.id: hero for hero in heroes}
+
+def update_hero(session:Session,hero_id:int,hero_data:dict,commit:bool=True)->Hero | None:
+    """更新英雄（单条 UPDATE 语句，无需先查询）"""
+    # 只保留模型中存在且不为 None 的字段
+    clean = {key:value for key,value in hero_data.items()
+             if value is not None and key in _HERO_FIELDS}
+
+    if clean:
+        statement = update(Hero).where(Hero.id == hero_id).values(**clean)
+        result = session.exec(statement)
+        _invalidate_hero(session,hero_id)
+        if commit:
+            session.commit()
+        found = result.rowcount > 0
+    else:
+        found = session.get(Hero,hero_id) is not None
+
+    if not found:
+        log.warning("❌ 未找到 ID 为 %s 的英雄", hero_id)
         return None
-    
-    for key,value in hero_data.items():
-        if hasattr(hero,key) and value is not None:
-            setattr(hero,key,value)
 
-    session.add(hero)
-    session.commit()
-    session.refresh(hero)
-    print(f"✅ 更新英雄成功: {hero.name}")
+    # UPDATE 已同步会话中的对象，已加载过的英雄直接从会话取出，不会再查询数据库
+    hero = session.get(Hero,hero_id)
+    log.info("✅ 更新英雄成功: %s", hero.name)
     return hero
 
-def delete_hero(session: Session,hero_id:id)->bool:
-    """删除英雄"""
-    # 从数据库中搜索指定行
-    hero = session.get(Hero,hero_id)
+def delete_hero(session: Session,hero_id:int,commit:bool=True)->bool:
+    """删除英雄（单条 DELETE 语句）"""
+    statement = delete(Hero).where(Hero.id == hero_id)
+    if session.get_bind().dialect.delete_returning:
+        # DELETE ... RETURNING 在删除的同时取回名字（SQLite >= 3.35）
+        hero_name = session.exec(statement.returning(Hero.name)).scalar()
+    else:
+        # 不支持 RETURNING 时先只查询名字这一列
+        hero_name = session.exec(select(Hero.name).where(Hero.id == hero_id)).first()
+        if hero_name is not None:
+            session.exec(statement)
+
     # 没有找到的话
-    if not hero:
-        print(f"❌ 未找到 ID 为 {hero_id} 的英雄")
+    if hero_name is None:
+        log.warning("❌ 未找到 ID 为 %s 的英雄", hero_id)
         return False
 
-    # 执行会话
-    session.delete(hero)    
-    session.commit()
-    print(f"🗑️ 删除英雄成功: {hero.name}")
+    _invalidate_hero(session,hero_id)
+    if commit:
+        session.commit()
+    log.info("🗑️ 删除英雄成功: %s", hero_name)
     return True
 
 def main():
     """主函数 - 演示 CRUD 操作"""
+    # 演示时把 CRUD 函数的 INFO 日志显示到终端
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("🚀 SQLModel 教程 - 第一个程序")
     print("=" * 40)
 
-    # 创建数据库表
-    create_db_and_tables()
-
-    # 获取数据库会话
-    session_gen = get_session()
-    session = next(session_gen)
+    # 创建数据库表（结构版本未变时跳过）
+    create_db_and_tables_if_needed()
 
     try:
-        # 1. 创建英雄
-        print("\n1️⃣ 创建英雄")
-        hero1_data = HeroCreate(
-            name="Spider-Man",
-            secret_name="Peter Parker",
-            age=25
-        )
-        hero1 = create_hero(session, hero1_data)
-        
-        hero2_data = HeroCreate(
-            name="Iron Man",
-            secret_name="Tony Stark",
-            age=45
-        )
-        hero2 = create_hero(session, hero2_data)
+        # 离开 with 时自动提交或回滚，并把连接归还连接池
+        with session_scope() as session:
+            # 1-5 步的写操作放在同一个事务中，结束时只提交一次
+            with session.begin():
+                # 1. 创建英雄
+                print("\n1️⃣ 创建英雄")
+                hero1_data = HeroCreate(
+                    name="Spider-Man",
+                    secret_name="Peter Parker",
+                    age=25
+                )
+                hero2_data = HeroCreate(
+                    name="Iron Man",
+                    secret_name="Tony Stark",
+                    age=45
+                )
+                hero1, hero2 = create_heroes(session, [hero1_data, hero2_data], commit=False)
         
-        # 2. 查询所有英雄
-        print("\n2️⃣ 查询所有英雄")
-        all_heroes = get_heroes(session)
-        for hero in all_heroes:
-            print(f"  - {hero.name} ({hero.secret_name}), 年龄: {hero.age}")
+                # 2. 查询所有英雄
+                print("\n2️⃣ 查询所有英雄")
+                for hero in iter_heroes(session):
+                    print(f"  - {hero.name} ({hero.secret_name}), 年龄: {hero.age}")
         
-        # 3. 根据 ID 查询英雄
-        print("\n3️⃣ 根据 ID 查询英雄")
-        hero = get_hero_by_id(session, 1)
-        if hero:
-            print(f"  英雄详情: {hero.name}, 创建时间: {hero.created_at}")
+                # 3. 根据 ID 查询英雄
+                print("\n3️⃣ 根据 ID 查询英雄")
+                hero = get_hero_by_id(session, 1)
+                if hero:
+                    print(f"  英雄详情: {hero.name}, 创建时间: {hero.created_at}")
         
-        # 4. 更新英雄信息
-        print("\n4️⃣ 更新英雄信息")
-        updated_hero = update_hero(session, 1, {"age": 26})
-        if updated_hero:
-            print(f"  更新后年龄: {updated_hero.age}")
+                # 4. 更新英雄信息
+                print("\n4️⃣ 更新英雄信息")
+                updated_hero = update_hero(session, 1, {"age": 26}, commit=False)
+                if updated_hero:
+                    print(f"  更新后年龄: {updated_hero.age}")
         
-        # 5. 删除英雄
-        print("\n5️⃣ 删除英雄")
-        delete_success = delete_hero(session, 2)
+                # 5. 删除英雄
+                print("\n5️⃣ 删除英雄")
+                delete_success = delete_hero(session, 2, commit=False)
         
-        # 6. 再次查询验证
-        print("\n6️⃣ 验证删除结果")
-        remaining_heroes = get_heroes(session)
-        for hero in remaining_heroes:
-            print(f"  - {hero.name} ({hero.secret_name})")
+            # 6. 再次查询验证
+            print("\n6️⃣ 验证删除结果")
+            for hero in iter_heroes(session):
+                print(f"  - {hero.name} ({hero.secret_name})")
             
     except Exception as e:
         print(f"❌ 程序执行出错: {e}")
-        session.rollback()
     finally:
-        session.close()
         print("\n🎉 程序执行完成")
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+"""自定义数据库列类型"""
+import uuid
+from decimal import Decimal
+
+from sqlalchemy.types import BINARY, BigInteger, TypeDecorator
+
+
+class UUIDBinary(TypeDecorator):
+    """以 16 字节二进制存储 UUID（默认是 36 字符的文本）"""
+    impl = BINARY
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(length=16)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return uuid.UUID(bytes=bytes(value))
+
+
+class ScaledDecimal(TypeDecorator):
+    """把 Decimal 按固定小数位数放大后以整数存储，例如 scale=2 时 12.34 存为 1234"""
+    impl = BigInteger
+    cache_ok = True
+
+    def __init__(self, scale: int = 2):
+        super().__init__()
+        self.scale = scale
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(Decimal(value).scaleb(self.scale).to_integral_value())
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-self.scale)
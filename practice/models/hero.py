@@ -1,11 +1,17 @@
 from email.policy import default
 from pydoc import describe
-from typing import Optional
+from typing import Annotated, Optional
+from pydantic import ConfigDict, create_model
 from sqlmodel import Field, SQLModel
 from datetime import datetime
 
 class HeroBase(SQLModel):
     """英雄基础模型（共享字段）"""
+    # 延迟构建验证器：首次验证/序列化时才生成，子类继承该配置。
+    # 生成后 pydantic 会把核心 schema 和验证器缓存在类上，之后直接复用，
+    # 因此这里不在导入时调用 model_rebuild()，以免失去延迟构建的效果
+    model_config = ConfigDict(defer_build=True)
+
     name: str = Field(
         max_length = 50 ,
         description = "英雄名称"
@@ -23,7 +29,7 @@ class Hero(HeroBase, table=True):
     """英雄模型（数据库表）"""
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    
+
 class HeroCreate(HeroBase):
     """创建英雄的请求模型"""
     pass
@@ -33,8 +39,24 @@ class HeroRead(HeroBase):
     id: int
     created_at: datetime
 
-class HeroUpdate(SQLModel):
-    """更新英雄的请求模型"""
-    name: Optional[str] = Field(default=None, max_length=50)
-    secret_name: Optional[str] = None
-    age: Optional[int] = Field(default=None, ge=0, le=200)
\ No newline at end of file
+def _optional_fields(model: type[SQLModel]) -> dict:
+    """把模型的全部字段转换为可选字段（默认 None），保留原有约束"""
+    fields = {}
+    for name, field in model.model_fields.items():
+        annotation = Optional[field.annotation]
+        if field.metadata:
+            annotation = Annotated[annotation, *field.metadata]
+        fields[name] = (annotation, Field(default=None, description=field.description))
+    return fields
+
+class _UpdateModel(SQLModel):
+    """更新请求模型的基类，不继承 HeroBase 以免被当作创建模型使用"""
+    model_config = ConfigDict(defer_build=True)
+
+# 更新英雄的请求模型：由 HeroBase 的字段自动派生，所有字段改为可选
+HeroUpdate = create_model(
+    "HeroUpdate",
+    __base__=_UpdateModel,
+    __doc__="更新英雄的请求模型",
+    **_optional_fields(HeroBase),
+)
@@ -1,14 +1,19 @@
 from sqlmodel import create_engine
 
+from config.database import SQL_ECHO, apply_sqlite_pragmas
+
 # SQLite 数据库配置
 DATABASE_URL = "sqlite:///./test.db"
 
 # 创建引擎
 engine = create_engine(
     DATABASE_URL,
-    echo = True,
+    echo = SQL_ECHO,  # 调试时才输出 SQL
     connect_args={"check_same_thread":False}
 )
 
+# 连接时启用 WAL、内存映射等 SQLite 性能设置
+apply_sqlite_pragmas(engine)
+
 print("SQLite 数据库配置完成")
 print(f"数据库文件位置：{DATABASE_URL}")
\ No newline at end of file
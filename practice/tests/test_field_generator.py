@@ -0,0 +1,128 @@
+from itertools import product
+
+import pytest
+
+from field_generator_gui import _EMITTERS, _FIELD_TYPES, FieldSpec, _imports_for
+
+
+def _spec(field_type, **options):
+    """构造字段定义，未指定的选项取空值"""
+    values = dict(name="value", type=field_type, optional=False, primary_key=False)
+    values.update(options)
+    return FieldSpec(**values)
+
+
+def _emit(field_type, **options):
+    return _EMITTERS[field_type](_spec(field_type, **options))
+
+
+def _reference_field_code(field_info: FieldSpec) -> str:
+    """按类型派发之前逐项判断的生成逻辑，作为对照"""
+    field_type = field_info.type
+    params = []
+    default = field_info.default
+    if default is not None:
+        if default.lower() in ("none", "null"):
+            params.append("default=None")
+        elif default.lower() == "true":
+            params.append("default=True")
+        elif default.lower() == "false":
+            params.append("default=False")
+        elif default.startswith(("datetime.", "uuid.")):
+            params.append(f"default_factory={default}")
+        else:
+            try:
+                float(default)
+                params.append(f"default={default}")
+            except ValueError:
+                params.append(f'default="{default}"')
+    elif field_info.optional:
+        params.append("default=None")
+    if field_info.primary_key:
+        params.append("primary_key=True")
+    if field_info.min_value:
+        params.append(f"{'min_length' if field_type == 'str' else 'ge'}={field_info.min_value}")
+    if field_info.max_value:
+        params.append(f"{'max_length' if field_type == 'str' else 'le'}={field_info.max_value}")
+    if field_type == "Decimal":
+        if field_info.max_value:
+            params.append(f"max_digits={field_info.max_value}")
+        if field_info.decimal_places:
+            params.append(f"decimal_places={field_info.decimal_places}")
+    if field_info.description:
+        params.append(f'description="{field_info.description}"')
+    annotation = f"Optional[{field_type}]" if field_info.optional else field_type
+    return f"{field_info.name}: {annotation} = Field({', '.join(params)})"
+
+
+def test_every_field_type_has_an_emitter():
+    assert set(_EMITTERS) == set(_FIELD_TYPES.values())
+
+
+@pytest.mark.parametrize("field_type, options, expected", [
+    ("int", {}, "value: int = Field()"),
+    ("int", {"optional": True}, "value: Optional[int] = Field(default=None)"),
+    ("int", {"primary_key": True, "optional": True},
+     "value: Optional[int] = Field(default=None, primary_key=True)"),
+    ("int", {"min_value": "0", "max_value": "200"}, "value: int = Field(ge=0, le=200)"),
+    ("str", {"min_value": "1", "max_value": "50", "description": "名称"},
+     'value: str = Field(min_length=1, max_length=50, description="名称")'),
+    ("Decimal", {"max_value": "10", "decimal_places": "2"},
+     "value: Decimal = Field(le=10, max_digits=10, decimal_places=2)"),
+    ("Decimal", {"decimal_places": "2"}, "value: Decimal = Field(decimal_places=2)"),
+    ("float", {"decimal_places": "2"}, "value: float = Field()"),
+    ("bool", {"default": "True"}, "value: bool = Field(default=True)"),
+    ("str", {"default": "null", "optional": True}, "value: Optional[str] = Field(default=None)"),
+    ("datetime", {"default": "datetime.utcnow"}, "value: datetime = Field(default_factory=datetime.utcnow)"),
+    ("uuid.UUID", {"default": "uuid.uuid4"}, "value: uuid.UUID = Field(default_factory=uuid.uuid4)"),
+    ("List[str]", {"optional": True}, "value: Optional[List[str]] = Field(default=None)"),
+    ("str", {"default": "guest"}, 'value: str = Field(default="guest")'),
+])
+def test_emitter_output(field_type, options, expected):
+    assert _emit(field_type, **options) == expected
+
+
+@pytest.mark.parametrize("default", ["0", "-1", "+3", ".5", "1.", "1.5e-3", "1_000"])
+def test_numeric_defaults(default):
+    """数字默认值原样生成，不加引号"""
+    assert _emit("float", default=default) == f"value: float = Field(default={default})"
+
+
+@pytest.mark.parametrize("default", ["inf", "nan", "Infinity", "1.2.3", "abc"])
+def test_non_numeric_defaults(default):
+    """inf、nan 等不是 Python 数字字面量，按字符串生成"""
+    assert _emit("float", default=default) == f'value: float = Field(default="{default}")'
+
+
+@pytest.mark.parametrize("field_type", sorted(set(_FIELD_TYPES.values())))
+def test_emitters_match_reference(field_type):
+    """所有选项组合的输出与对照实现一致"""
+    defaults = [None, "none", "True", "false", "datetime.now", "uuid.uuid4", "5", "-2.5", "1_000", "text"]
+    for optional, primary_key, default, min_value, max_value, decimal_places, description in product(
+        (False, True), (False, True), defaults, (None, "1"), (None, "9"), (None, "2"), (None, "说明"),
+    ):
+        field_info = _spec(
+            field_type,
+            optional=optional,
+            primary_key=primary_key,
+            default=default,
+            min_value=min_value,
+            max_value=max_value,
+            decimal_places=decimal_places,
+            description=description,
+        )
+        assert _EMITTERS[field_type](field_info) == _reference_field_code(field_info)
+
+
+def test_imports_for():
+    """导入语句按字段类型合并并排序"""
+    assert _imports_for(frozenset({"int"})) == (
+        "from sqlmodel import SQLModel, Field",
+        "from typing import Optional",
+    )
+    assert _imports_for(frozenset({"Decimal", "date", "datetime"})) == (
+        "from datetime import datetime, date, time",
+        "from decimal import Decimal",
+        "from sqlmodel import SQLModel, Field",
+        "from typing import Optional",
+    )
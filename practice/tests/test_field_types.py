@@ -0,0 +1,66 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+
+from models.field_types import ScaledDecimal, UUIDBinary
+
+
+@pytest.fixture
+def table():
+    """内存数据库中使用自定义列类型的测试表"""
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    table = Table(
+        "field_types",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("uuid_value", UUIDBinary()),
+        Column("amount", ScaledDecimal(2)),
+    )
+    metadata.create_all(engine)
+    yield engine, table
+    engine.dispose()
+
+
+def test_uuid_binary_bind_and_result():
+    """UUID 存为 16 字节，读取时还原为 UUID"""
+    value = uuid.uuid4()
+    column_type = UUIDBinary()
+    stored = column_type.process_bind_param(value, None)
+    assert stored == value.bytes
+    assert len(stored) == 16
+    assert column_type.process_result_value(stored, None) == value
+    assert column_type.process_bind_param(str(value), None) == value.bytes
+
+
+def test_scaled_decimal_bind_and_result():
+    """Decimal 按小数位数放大为整数存储，读取时还原"""
+    column_type = ScaledDecimal(2)
+    assert column_type.process_bind_param(Decimal("12.34"), None) == 1234
+    assert column_type.process_result_value(1234, None) == Decimal("12.34")
+
+
+@pytest.mark.parametrize("column_type", [UUIDBinary(), ScaledDecimal(2)])
+def test_none_is_kept(column_type):
+    """None 原样写入和读取"""
+    assert column_type.process_bind_param(None, None) is None
+    assert column_type.process_result_value(None, None) is None
+
+
+def test_database_round_trip(table):
+    """写入数据库后读取，值保持不变"""
+    engine, table = table
+    value = uuid.uuid4()
+    with engine.begin() as connection:
+        connection.execute(insert(table), [
+            {"id": 1, "uuid_value": value, "amount": Decimal("12.34")},
+            {"id": 2, "uuid_value": None, "amount": None},
+        ])
+        rows = connection.execute(select(table.c.uuid_value, table.c.amount).order_by(table.c.id)).all()
+        raw = connection.exec_driver_sql("SELECT uuid_value, amount FROM field_types WHERE id = 1").one()
+
+    assert rows == [(value, Decimal("12.34")), (None, None)]
+    assert bytes(raw[0]) == value.bytes
+    assert raw[1] == 1234
@@ -0,0 +1,171 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+import main
+from main import (
+    create_hero,
+    create_heroes,
+    delete_hero,
+    get_hero_by_id,
+    get_heroes_by_ids,
+    hero_exists,
+    update_hero,
+)
+from models.hero import Hero, HeroBase, HeroCreate, HeroUpdate
+
+
+@pytest.fixture
+def engine():
+    """每个测试使用独立的内存数据库，并清空英雄缓存"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    main._HERO_CACHE.clear()
+    yield engine
+    main._HERO_CACHE.clear()
+    engine.dispose()
+
+
+def _cached_hero_id(engine) -> int:
+    """创建一个英雄并通过 get_hero_by_id 把它写入缓存"""
+    with Session(engine) as session:
+        hero_id = create_hero(session, HeroCreate(name="Spider-Man", secret_name="Peter Parker", age=25)).id
+    with Session(engine) as session:
+        get_hero_by_id(session, hero_id)
+        session.commit()
+    return hero_id
+
+
+def test_hero_update_fields_are_optional():
+    """更新模型的字段都可省略，且不是创建模型"""
+    update = HeroUpdate()
+    assert update.model_dump() == {"name": None, "secret_name": None, "age": None}
+    assert not isinstance(update, HeroBase)
+    assert HeroUpdate(age=30).model_dump(exclude_unset=True) == {"age": 30}
+
+
+@pytest.mark.parametrize("data", [{"name": "x" * 51}, {"age": -1}, {"age": 201}])
+def test_hero_update_keeps_constraints(data):
+    """更新模型保留 HeroBase 的 max_length、ge、le 约束"""
+    with pytest.raises(ValidationError):
+        HeroUpdate(**data)
+
+
+def test_create_heroes_empty_batch(engine):
+    """空列表不执行 INSERT，直接返回空列表"""
+    with Session(engine) as session:
+        assert create_heroes(session, []) == []
+
+
+def test_hero_exists(engine):
+    """只判断英雄是否存在"""
+    with Session(engine) as session:
+        hero_id = create_hero(session, HeroCreate(name="Spider-Man", secret_name="Peter Parker")).id
+        assert hero_exists(session, hero_id)
+        assert not hero_exists(session, hero_id + 1)
+
+
+def test_get_heroes_by_ids(engine):
+    """一次查询取回多个英雄，不存在的 ID 不出现在结果中"""
+    with Session(engine) as session:
+        heroes = create_heroes(session, [
+            HeroCreate(name="Spider-Man", secret_name="Peter Parker"),
+            HeroCreate(name="Iron Man", secret_name="Tony Stark"),
+        ])
+        ids = [hero.id for hero in heroes]
+        found = get_heroes_by_ids(session, [*ids, 999])
+        assert sorted(found) == sorted(ids)
+        assert found[ids[1]].name == "Iron Man"
+        assert get_heroes_by_ids(session, []) == {}
+
+
+def test_cache_hit_after_commit(engine):
+    """提交后的英雄从缓存读取，不再查询数据库"""
+    hero_id = _cached_hero_id(engine)
+    assert hero_id in main._HERO_CACHE
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with Session(engine) as session:
+        hero = get_hero_by_id(session, hero_id)
+        assert hero.name == "Spider-Man"
+    assert statements == []
+
+
+def test_cache_keeps_pending_edits(engine):
+    """会话中已修改的英雄不会被缓存副本覆盖"""
+    hero_id = _cached_hero_id(engine)
+
+    with Session(engine) as session:
+        hero = session.get(Hero, hero_id)
+        hero.age = 99
+        assert get_hero_by_id(session, hero_id) is hero
+        assert hero.age == 99
+        assert hero in session.dirty
+        session.commit()
+
+    with Session(engine) as session:
+        assert get_hero_by_id(session, hero_id).age == 99
+
+
+def test_update_invalidates_cache(engine):
+    """更新英雄后缓存失效"""
+    hero_id = _cached_hero_id(engine)
+
+    with Session(engine) as session:
+        update_hero(session, hero_id, {"age": 30})
+    assert hero_id not in main._HERO_CACHE
+
+    with Session(engine) as session:
+        assert get_hero_by_id(session, hero_id).age == 30
+
+
+def test_delete_invalidates_cache(engine):
+    """删除英雄后缓存失效"""
+    hero_id = _cached_hero_id(engine)
+
+    with Session(engine) as session:
+        assert delete_hero(session, hero_id)
+    assert hero_id not in main._HERO_CACHE
+
+    with Session(engine) as session:
+        assert get_hero_by_id(session, hero_id) is None
+
+
+def test_rollback_is_not_cached(engine):
+    """回滚的事务中查到的英雄不会进入缓存"""
+    with Session(engine) as session:
+        hero = create_hero(session, HeroCreate(name="Ghost", secret_name="Nobody"), commit=False)
+        hero_id = hero.id
+        assert get_hero_by_id(session, hero_id) is hero
+        session.rollback()
+    assert hero_id not in main._HERO_CACHE
+
+    with Session(engine) as session:
+        assert get_hero_by_id(session, hero_id) is None
+
+
+def test_concurrent_update_is_not_cached(tmp_path):
+    """读取后被其他会话修改的英雄，提交时不写入缓存"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'heroes.db'}")
+    SQLModel.metadata.create_all(engine)
+    main._HERO_CACHE.clear()
+    with Session(engine) as session:
+        hero_id = create_hero(session, HeroCreate(name="Spider-Man", secret_name="Peter Parker", age=25)).id
+
+    with Session(engine) as reader:
+        assert get_hero_by_id(reader, hero_id).age == 25
+        with Session(engine) as writer:
+            update_hero(writer, hero_id, {"age": 30})
+        reader.commit()
+    assert hero_id not in main._HERO_CACHE
+
+    with Session(engine) as session:
+        assert get_hero_by_id(session, hero_id).age == 30
+    engine.dispose()